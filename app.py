@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import os
+import re
 import plotly.express as px
-from io import StringIO
 import random
 import time
 
@@ -9,6 +11,10 @@ import time
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+# Pause between streamed chat words, purely for the typing effect
+CHAT_WORD_DELAY = 0.05
+
+
 def response_generator():
     response = random.choice(
         [
@@ -21,7 +27,48 @@ def response_generator():
     )
     for word in response.split():
         yield word + " "
-        time.sleep(0.05)
+        if CHAT_WORD_DELAY:
+            time.sleep(CHAT_WORD_DELAY)
+
+
+@st.fragment
+def chat_demo():
+    """
+    Renders the sidebar chat history and input.
+
+    Runs as a fragment, so sending a message reruns only the chat instead of
+    reloading the filters, charts and tables of the whole dashboard.
+    """
+    # Use a container to display chat history cleanly in the sidebar
+    chat_container = st.container(height=300, border=True)
+
+    with chat_container:
+        # Display chat messages from history
+        for message in st.session_state.messages:
+            with st.chat_message(message["role"]):
+                # The chat message content must be markdown for proper rendering
+                st.markdown(message["content"])
+
+    # Accept user input; the fragment is called inside the sidebar block, so
+    # the input inherits the sidebar context
+    if prompt := st.chat_input("What is up?", key="sidebar_chat_input"):
+
+        # Add user message to chat history
+        st.session_state.messages.append({"role": "user", "content": prompt})
+
+        # Display user message in the chat container
+        with chat_container:
+            with st.chat_message("user"):
+                st.markdown(prompt)
+
+        # Display assistant response in chat container
+        with chat_container:
+            with st.chat_message("assistant"):
+                # Use st.write_stream to generate and display the streamed response
+                response = st.write_stream(response_generator())
+
+        # Add assistant response to chat history (after streaming is complete)
+        st.session_state.messages.append({"role": "assistant", "content": response})
 
 
 # --- Page Configuration ---
@@ -33,7 +80,7 @@ st.set_page_config(
 )
 
 # --- Custom CSS ---
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .title {
         font-size: 2.5rem;
@@ -75,108 +122,585 @@ st.markdown("""
         box-shadow: 0 4px 6px rgba(0,0,0,0.05);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+# --- Static HTML ---
+# Page blocks that don't depend on the data are kept as constants and each
+# emitted with a single st.markdown call
+HEADER_HTML = """
+<h1 class='title'>🌍 ESA EO Missions - 🛡️ Security & Compliance Demo Dashboard</h1>
+<div class='info-box'>
+    <p><strong>Demo Dashboard for ESA Earth Observation Missions</strong></p>
+    <p>This interactive dashboard provides real-time security and compliance monitoring across ESA's Earth Observation missions: 
+    <strong>FLEX</strong>, <strong>BIOMASS</strong>, and <strong>EARTHCARE</strong>.</p>
+    <p>Use the filters in the sidebar to select missions, report types, and date ranges for detailed analysis.</p>
+    <p style="margin-top: 10px; font-size: 0.9rem; color: #7f8c8d;">
+        <em>Demonstration system developed by GTT Communications for ESA mission security operations.</em>
+    </p>
+</div>
+"""
+
+HELP_HTML = """
+<div style="background-color:#f0f0f0; padding:10px; border-radius:5px; margin-top:20px;">
+    <h4>Need Help?</h4>
+    <p>This dashboard visualizes data from 5 report types:</p>
+    <ul>
+        <li><b>Security Incidents</b>: Active threats and attacks.</li>
+        <li><b>Compliance Reports</b>: Audits against standards.</li>
+        <li><b>Verification Reports</b>: Technical control checks.</li>
+        <li><b>Risk Assessments</b>: Identified business risks.</li>
+        <li><b>Regular Reports</b>: Weekly/monthly status.</li>
+    </ul>
+</div>
+"""
+
+FOOTER_HTML = """
+<div style="background-color:#f0f0f0; padding:10px; border-radius:5px; margin-top:20px; text-align:center;">
+    <p>Mission Security Dashboard | Data as of: {data_as_of}</p>
+</div>
+"""
 
 
 # --- Data Loading and Caching ---
-@st.cache_data
-def load_data(csv_path="mission_security_reports.csv"):
+# Low-cardinality columns are stored as categoricals so filters and counts
+# work on integer codes rather than Python strings
+CATEGORY_DTYPES = {
+    'mission': 'category',
+    'report_type': 'category',
+    'risk_level': 'category',
+    'status': 'category',
+    'attack_type': 'category',
+}
+
+# Columns needed by the filters, KPIs and charts; the long free-text columns
+# are only read by the detail tabs
+SUMMARY_COLUMNS = [
+    'mission', 'report_type', 'date', 'risk_level', 'status',
+    'attack_type', 'time_to_fix_hours',
+]
+
+# Report types with a dedicated section in the dashboard
+KNOWN_REPORT_TYPES = [
+    'Security Incident Report',
+    'Compliance Report',
+    'Security Verification Report',
+    'Security Risk Assessment Report',
+    'Security Regular Report',
+]
+
+
+def read_reports_csv(csv_path):
     """
-    Loads and cleans the mission security report data with proper CSV parsing.
+    Parses and cleans the raw report CSV.
+
+    Returns the cleaned frame and whether every line was parsed; a lossy
+    fallback load should not be persisted.
     """
+    complete = True
     try:
-        # Read the file content first
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Fix the CSV by properly quoting fields that contain commas
-        lines = content.strip().split('\n')
-        fixed_lines = []
-
-        for i, line in enumerate(lines):
-            if i == 0:
-                # Keep header as-is
-                fixed_lines.append(line)
-            else:
-                # Split by comma but be careful with embedded commas
-                parts = []
-                current_part = []
-                in_quotes = False
-
-                for char in line:
-                    if char == '"':
-                        in_quotes = not in_quotes
-                        current_part.append(char)
-                    elif char == ',' and not in_quotes:
-                        parts.append(''.join(current_part))
-                        current_part = []
-                    else:
-                        current_part.append(char)
-
-                # Add last part
-                if current_part:
-                    parts.append(''.join(current_part))
-
-                # Now quote any part that contains commas or colons and isn't already quoted
-                fixed_parts = []
-                for part in parts:
-                    part = part.strip()
-                    if part and not part.startswith('"') and (',' in part or ':' in part):
-                        fixed_parts.append(f'"{part}"')
-                    else:
-                        fixed_parts.append(part)
-
-                fixed_lines.append(','.join(fixed_parts))
-
-        # Read from the fixed content
-        fixed_content = '\n'.join(fixed_lines)
-        df = pd.read_csv(StringIO(fixed_content), quotechar='"')
+        # The C tokenizer honours quoted fields and types dates and categoricals
+        # itself, so no pre-pass is needed; fix times are coerced below so that
+        # a stray non-numeric value becomes NaN instead of failing the parse
+        df = pd.read_csv(
+            csv_path,
+            engine='c',
+            quotechar='"',
+            parse_dates=['date'],
+            dtype=CATEGORY_DTYPES
+        )
 
     except FileNotFoundError:
         st.error(f"Error: The data file '{csv_path}' was not found.")
         st.stop()
     except Exception as e:
         st.error(f"Error loading CSV: {e}")
-        # Try alternative method - skip bad lines
+        # Try alternative method - skip bad lines (still on the C tokenizer)
         try:
             df = pd.read_csv(
                 csv_path,
                 on_bad_lines='skip',
-                engine='python'
+                engine='c',
+                parse_dates=['date'],
+                dtype=CATEGORY_DTYPES
             )
+            complete = False
             st.warning("Loaded with some lines skipped due to parsing errors.")
         except Exception as e2:
             st.error(f"Critical error: {e2}")
             st.stop()
 
-    # Data Cleaning and Transformation
-    df['date'] = pd.to_datetime(df['date'])
-    df['time_to_fix_hours'] = pd.to_numeric(df['time_to_fix_hours'], errors='coerce')
+    # Data Cleaning and Transformation; dates only need a cast when the
+    # format was not recognised while parsing
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df['date'] = pd.to_datetime(df['date'])
+    df['time_to_fix_hours'] = pd.to_numeric(df['time_to_fix_hours'], errors='coerce').astype('float32')
 
     # Fill N/A in key categorical fields
     str_cols_to_fill = ['risk_level', 'status', 'attack_type']
     for col in str_cols_to_fill:
         if col in df.columns:
+            if 'N/A' not in df[col].cat.categories:
+                df[col] = df[col].cat.add_categories('N/A')
             df[col] = df[col].fillna('N/A')
 
-    return df
+    # Keep the free-text columns Arrow-backed so st.dataframe can serialise
+    # them without converting Python string objects on every rerun
+    text_cols = [col for col in df.columns if col not in SUMMARY_COLUMNS]
+    df[text_cols] = df[text_cols].astype('string[pyarrow]')
+
+    return df, complete
+
+
+# Bump whenever read_reports_csv changes how the data is cleaned, so cached
+# Parquet files written by older code are not served
+PARQUET_CACHE_VERSION = 1
+
+
+def parquet_cache_path(csv_path):
+    """
+    Returns the Parquet cache file for csv_path, or None if the CSV is missing.
+
+    The name embeds PARQUET_CACHE_VERSION and the CSV's mtime and size, so
+    changing the cleaning code or editing the CSV automatically points at a
+    fresh cache entry.
+    """
+    try:
+        stat = os.stat(csv_path)
+    except OSError:
+        return None
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    cache_dir = os.path.join(os.path.dirname(csv_path), '.cache')
+    return os.path.join(
+        cache_dir,
+        f"{stem}_v{PARQUET_CACHE_VERSION}_{stat.st_mtime_ns}_{stat.st_size}.parquet"
+    )
+
+
+def remove_stale_parquet(parquet_path, csv_path):
+    """Removes cache files for csv_path other than parquet_path."""
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    cache_dir = os.path.dirname(parquet_path)
+    # Only <stem>_[v<version>_]<mtime>_<size>.parquet names are ours; a
+    # sibling CSV named <stem>_<digits> has one more part and is left alone
+    pattern = re.compile(rf"{re.escape(stem)}_(?:v\d+_)?\d+_\d+\.parquet")
+    for name in os.listdir(cache_dir):
+        if not pattern.fullmatch(name):
+            continue
+        path = os.path.join(cache_dir, name)
+        if path != parquet_path:
+            os.remove(path)
+
+
+@st.cache_resource(show_spinner='Loading reports...')
+def load_data(csv_path="mission_security_reports.csv"):
+    """
+    Loads the cleaned report data and precomputes the filter bookkeeping.
+
+    Parsing and cleaning live in read_reports_csv; the cleaned frame is
+    persisted as Parquet under .cache/ next to the CSV, keyed by
+    PARQUET_CACHE_VERSION and the CSV's modification time and size, so later
+    starts skip parsing until either changes. Older cache files for the same
+    CSV are removed once the new one is written.
+
+    Returns a (summary, full, meta) tuple: the summary frame holds
+    SUMMARY_COLUMNS plus a day-floored 'date_d' and drives filtering, the
+    full frame is indexed with the same labels for rendering the detail
+    tables, and meta holds values that only change with the data. Both frames
+    are sorted by report date.
+
+    meta keys:
+
+    - 'partitions': row positions of each of KNOWN_REPORT_TYPES
+    - 'rated': row positions of reports with a risk level other than N/A
+    - 'missions', 'report_types', 'risks': sorted sidebar filter options
+    - 'min_date', 'max_date': bounds of the report dates
+    - 'daily': report counts per day, mission, report type and risk level,
+      sorted by day
+
+    The result is cached as a shared resource rather than copied on every
+    access, so callers must treat the returned frames as read-only.
+    """
+    parquet_path = parquet_cache_path(csv_path)
+    df = None
+    if parquet_path is not None and os.path.exists(parquet_path):
+        try:
+            df = pd.read_parquet(parquet_path)
+        except Exception:
+            # Unreadable cache file; rebuild it from the CSV below
+            df = None
+
+    if df is None:
+        df, complete = read_reports_csv(csv_path)
+        if complete and parquet_path is not None:
+            try:
+                os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+                df.to_parquet(parquet_path, compression='zstd')
+                remove_stale_parquet(parquet_path, csv_path)
+            except Exception:
+                # Caching is best effort (read-only checkout, no Parquet engine)
+                pass
+
+    # Keep the reports in date order; row positions below (partitions, the
+    # date column) all refer to this ordering
+    if not df['date'].is_monotonic_increasing:
+        df = df.sort_values('date', kind='stable', ignore_index=True)
+
+    # The report types are fixed, so partition the rows once here rather than
+    # scanning report_type on every rerun
+    report_types = df['report_type'].values
+    meta = {
+        'partitions': {
+            rt: np.flatnonzero(report_types == rt) for rt in KNOWN_REPORT_TYPES
+        },
+        'rated': np.flatnonzero(df['risk_level'].values != 'N/A'),
+        'missions': sorted(df['mission'].cat.categories.tolist()),
+        'report_types': sorted(df['report_type'].cat.categories.tolist()),
+        'risks': sorted(r for r in df['risk_level'].cat.categories if r != 'N/A'),
+        'min_date': df['date'].min().date(),
+        'max_date': df['date'].max().date(),
+    }
+
+    # Day-resolution copy of the report date, used as the date filter and
+    # timeline key so neither has to convert dates on every rerun
+    summary = df[SUMMARY_COLUMNS].copy()
+    summary['date_d'] = summary['date'].dt.floor('D')
+
+    # Daily counts keyed on every filtered dimension, so the timeline can be
+    # sliced from this small table instead of regrouping the reports
+    meta['daily'] = (
+        summary.set_index('date')
+        .groupby(['mission', 'report_type', 'risk_level'], observed=True)
+        .resample('D').size()
+        # resample fills every day between a group's first and last report;
+        # keep only days that actually have reports
+        .loc[lambda c: c > 0]
+        .rename('Count')
+        .reset_index()
+        .rename(columns={'date': 'date_d'})
+        .sort_values('date_d', kind='stable', ignore_index=True)
+    )
+
+    return summary, df, meta
+
+
+def category_mask(column, selected):
+    """
+    Returns a boolean array marking rows of a categorical column whose value
+    is in selected.
+
+    With up to 64 categories the selection is packed into a uint64 bitmask
+    over the category codes and tested with a shift and an AND per row;
+    larger category sets fall back to isin.
+    """
+    categories = column.cat.categories
+    if len(categories) > 64:
+        return column.isin(selected).values
+
+    bits = np.uint64(0)
+    for code in categories.get_indexer(list(selected)):
+        if code >= 0:
+            bits |= np.uint64(1) << np.uint64(code)
+
+    # Missing values have code -1 and are never selected
+    codes = column.cat.codes.to_numpy()
+    selected_rows = (bits >> codes.astype(np.uint64)) & np.uint64(1)
+    return (codes >= 0) & selected_rows.astype(bool)
+
+
+def selection_mask(df, meta, missions, report_types, start_date, end_date, risks):
+    """
+    Returns a boolean row mask of df for the sidebar selections.
+
+    df may be the summary frame or any frame with the same 'date_d',
+    'mission', 'report_type' and 'risk_level' columns (e.g. meta['daily']),
+    and must be sorted by 'date_d'.
+    """
+    # The frame is date-sorted, so the date range is a contiguous window found
+    # by binary search; the end bound is exclusive so the whole of end_date is
+    # included
+    start_ts = pd.Timestamp(start_date)
+    end_ts = pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    dates = df['date_d'].values
+    lo = np.searchsorted(dates, start_ts.to_datetime64(), side='left')
+    hi = np.searchsorted(dates, end_ts.to_datetime64(), side='left')
+    window = df.iloc[lo:hi]
+
+    # Only rows inside the window need the category tests, and a test is
+    # skipped entirely when every option is selected (the default state)
+    selected = np.ones(hi - lo, dtype=bool)
+    if len(missions) < len(meta['missions']):
+        selected &= category_mask(window['mission'], missions)
+    if len(report_types) < len(meta['report_types']):
+        selected &= category_mask(window['report_type'], report_types)
+    if len(risks) < len(meta['risks']):
+        selected &= category_mask(window['risk_level'], risks)
+
+    mask = np.zeros(len(df), dtype=bool)
+    mask[lo:hi] = selected
+    return mask
+
+
+@st.cache_data(show_spinner=False)
+def apply_filters(missions, report_types, start_date, end_date, risks):
+    """
+    Returns a boolean row mask of the reports matching the sidebar selections.
+
+    All arguments are hashable (tuples and dates) so reruns triggered by
+    unrelated widgets are served from the cache.
+    """
+    df, _, meta = load_data()
+    return selection_mask(df, meta, missions, report_types, start_date, end_date, risks)
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def split_by_report_type(missions, report_types, start_date, end_date, risks):
+    """
+    Returns a dict of report type -> filtered reports of that type.
+
+    Takes the same arguments as apply_filters. Held as a resource so reruns
+    with an unchanged selection reuse the same frames without copying them;
+    callers must treat them as read-only.
+    """
+    df, _, meta = load_data()
+    mask = apply_filters(missions, report_types, start_date, end_date, risks)
+
+    # Narrow the precomputed report-type partitions down to the filtered rows
+    return {
+        rt: df.iloc[positions[mask[positions]]]
+        for rt, positions in meta['partitions'].items()
+    }
+
+
+# --- Chart Helpers ---
+# Above this many points the timeline is downsampled before plotting
+TIMELINE_MAX_POINTS = 2000
+
+
+def downsample_m4(timeline_data, max_points=TIMELINE_MAX_POINTS, n_buckets=200):
+    """
+    Reduces each mission's timeline to at most four points per time bucket.
+
+    Keeps the first, last, minimum and maximum count of every bucket (M4),
+    which preserves the shape of the line while bounding the number of
+    points Plotly has to draw. max_points is shared evenly between the
+    missions: a mission within its share is kept as is, and the others use
+    at most n_buckets buckets, fewer if that is needed to fit the share.
+    """
+    groups = timeline_data.groupby('Mission', sort=False, observed=True)
+    share = max(max_points // max(groups.ngroups, 1), 4)
+    buckets_per_mission = min(n_buckets, share // 4)
+
+    kept = []
+    for _, series in groups:
+        series = series.sort_values('Date')
+        if len(series) <= share:
+            kept.append(series)
+            continue
+
+        t = pd.to_datetime(series['Date']).to_numpy(dtype='datetime64[ns]').view('i8')
+        bucket_width = (t[-1] - t[0]) // buckets_per_mission + 1
+        buckets = (t - t[0]) // bucket_width
+
+        positions = pd.Series(np.arange(len(series))).groupby(buckets)
+        counts = pd.Series(series['Count'].to_numpy()).groupby(buckets)
+        keep = np.unique(np.concatenate([
+            positions.first().to_numpy(),
+            positions.last().to_numpy(),
+            counts.idxmin().to_numpy(),
+            counts.idxmax().to_numpy(),
+        ]))
+        kept.append(series.iloc[keep])
+
+    return pd.concat(kept) if kept else timeline_data
+
+
+# Figures are cached as resources keyed on their aggregated data, so reruns
+# that leave the data unchanged skip building the Plotly figure
+@st.cache_resource(show_spinner=False, max_entries=32)
+def attack_type_chart(attack_counts):
+    """Bar chart of incident counts from (attack type, count) pairs."""
+    return px.bar(
+        pd.DataFrame(attack_counts, columns=['Attack Type', 'Count']),
+        x='Attack Type',
+        y='Count',
+        color='Attack Type',
+        title='Frequency of Attack Types'
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def risk_level_chart(risk_counts):
+    """Pie chart of report counts from (risk level, count) pairs."""
+    fig_pie = px.pie(
+        pd.DataFrame(risk_counts, columns=['Risk Level', 'Count']),
+        names='Risk Level',
+        values='Count',
+        color='Risk Level',
+        color_discrete_map={
+            'High': '#e74c3c',
+            'Medium': '#f39c12',
+            'Low': '#2ecc71'
+        },
+        title='Incidents by Risk Level'
+    )
+    fig_pie.update_traces(textinfo='percent+label')
+    return fig_pie
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def timeline_chart(timeline_rows):
+    """Line chart of daily submissions from (date, mission, count) rows."""
+    return px.line(
+        pd.DataFrame(timeline_rows, columns=['Date', 'Mission', 'Count']),
+        x='Date',
+        y='Count',
+        color='Mission',
+        title='Daily Report Submissions by Mission'
+    )
+
+
+# --- Table Helpers ---
+# Columns shown in each detail tab
+INCIDENT_COLUMNS = (
+    'mission', 'date', 'attack_type', 'risk_level', 'status',
+    'root_cause', 'remediation_measures', 'time_to_fix_hours',
+)
+COMPLIANCE_COLUMNS = (
+    'mission', 'date', 'compliance_evaluation_results',
+    'identified_non_conformities_and_recommendations',
+    'follow_up_actions_and_deadlines',
+)
+VERIFICATION_COLUMNS = (
+    'mission', 'date', 'security_control_checks',
+    'findings_from_technical_verifications',
+    'identified_gaps_and_proposed_corrective_actions',
+)
+RISK_COLUMNS = (
+    'mission', 'date', 'identified_risks_and_threat_scenarios', 'risk_level',
+    'likelihood_and_impact_assessments', 'existing_mitigations_and_residual_risks',
+    'risk_treatment_plan_and_responsible_entities',
+)
+REGULAR_COLUMNS = (
+    'mission', 'date', 'summary_of_ongoing_security_operations',
+    'notable_security_events', 'progress_on_mitigation_actions',
+)
+
+
+def safe_select_columns(dataframe, columns, index):
+    """Returns the rows in index with only the columns that exist in the dataframe."""
+    existing_cols = [col for col in columns if col in dataframe.columns]
+    if not existing_cols:
+        return pd.DataFrame()
+    # One gather of just the displayed columns
+    return dataframe.loc[index, existing_cols]
+
+
+@st.fragment
+def detail_tabs(df_full, report_groups, empty_df):
+    """
+    Renders the per-report-type detail tabs.
+
+    Runs as a fragment: switching tabs reruns only this section, reusing the
+    arguments of the last full run, rather than the KPIs, charts and sidebar.
+    """
+    incidents_df = report_groups.get('Security Incident Report', empty_df)
+    compliance_df = report_groups.get('Compliance Report', empty_df)
+    risk_df = report_groups.get('Security Risk Assessment Report', empty_df)
+
+    st.markdown("<h2 class='subtitle'>Detailed Findings & Action Items</h2>", unsafe_allow_html=True)
+
+    tab_inc, tab_comp, tab_ver, tab_risk, tab_reg = st.tabs([
+        "🚨 Incidents",
+        "📜 Compliance Findings",
+        "🔬 Verification Gaps",
+        "📈 Risk Treatment",
+        "📓 Regular Summaries"
+    ], on_change="rerun")
+    # Switching tabs reruns this fragment, so only the open tab's table is
+    # built and serialised; the hidden tabs skip their work entirely
+
+    with tab_inc:
+        if tab_inc.open:
+            st.subheader("Security Incident Details")
+            display_df = safe_select_columns(df_full, INCIDENT_COLUMNS, incidents_df.index)
+            if not display_df.empty:
+                st.dataframe(display_df, width='stretch')
+            else:
+                st.info("No incident data available.")
+
+    with tab_comp:
+        if tab_comp.open:
+            st.subheader("Compliance Non-Conformities")
+            display_df = safe_select_columns(df_full, COMPLIANCE_COLUMNS, compliance_df.index)
+            if not display_df.empty:
+                st.dataframe(display_df, width='stretch')
+            else:
+                st.info("No compliance data available.")
+
+    with tab_ver:
+        if tab_ver.open:
+            st.subheader("Security Verification Gaps")
+            verification_df = report_groups.get('Security Verification Report', empty_df)
+            display_df = safe_select_columns(df_full, VERIFICATION_COLUMNS, verification_df.index)
+            if not display_df.empty:
+                st.dataframe(display_df, width='stretch')
+            else:
+                st.info("No verification data available.")
+
+    with tab_risk:
+        if tab_risk.open:
+            st.subheader("Risk Assessment Treatment Plans")
+            display_df = safe_select_columns(df_full, RISK_COLUMNS, risk_df.index)
+            if not display_df.empty:
+                st.dataframe(display_df, width='stretch')
+            else:
+                st.info("No risk assessment data available.")
+
+    with tab_reg:
+        if tab_reg.open:
+            st.subheader("Regular Report Summaries")
+            regular_df = report_groups.get('Security Regular Report', empty_df)
+            display_df = safe_select_columns(df_full, REGULAR_COLUMNS, regular_df.index)
+            if not display_df.empty:
+                st.dataframe(display_df, width='stretch')
+            else:
+                st.info("No regular report data available.")
+
 
 # Load the data
-df = load_data()
+df, df_full, meta = load_data()
 
 
 # --- Header Section ---
 
 
+@st.cache_resource(show_spinner=False)
+def load_logo(path):
+    """
+    Returns the raw bytes of a logo image, or None if it can't be read.
+
+    Cached so the file is read once per process; the bytes are handed to
+    st.image as-is, without decoding them.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
 # Add ESA and GTT branding bar with logos
 try:
     col_logo1, col_text, col_logo2 = st.columns([1, 20, 1])
     
     with col_logo1:
-        # Try to load ESA logo
-        try:
-            st.image("esa_logo.png", width=40)
-        except:
+        esa_logo = load_logo("esa_logo.png")
+        if esa_logo is not None:
+            st.image(esa_logo, width=40)
+        else:
             st.markdown("🛰️")
     
     with col_text:
@@ -189,10 +713,10 @@ try:
         """, unsafe_allow_html=True)
     
     with col_logo2:
-        # Try to load GTT logo
-        try:
-            st.image("gtt_logo.png", width=80)
-        except:
+        gtt_logo = load_logo("gtt_logo.png")
+        if gtt_logo is not None:
+            st.image(gtt_logo, width=80)
+        else:
             st.markdown("🔷")
             
 except Exception as e:
@@ -204,18 +728,7 @@ except Exception as e:
         </span>
     </div>
     """, unsafe_allow_html=True)
-st.markdown("<h1 class='title'>🌍 ESA EO Missions - 🛡️ Security & Compliance Demo Dashboard</h1>", unsafe_allow_html=True)
-st.markdown("""
-<div class='info-box'>
-    <p><strong>Demo Dashboard for ESA Earth Observation Missions</strong></p>
-    <p>This interactive dashboard provides real-time security and compliance monitoring across ESA's Earth Observation missions: 
-    <strong>FLEX</strong>, <strong>BIOMASS</strong>, and <strong>EARTHCARE</strong>.</p>
-    <p>Use the filters in the sidebar to select missions, report types, and date ranges for detailed analysis.</p>
-    <p style="margin-top: 10px; font-size: 0.9rem; color: #7f8c8d;">
-        <em>Demonstration system developed by GTT Communications for ESA mission security operations.</em>
-    </p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
 
 # --- Sidebar for Filters ---
@@ -223,7 +736,7 @@ with st.sidebar:
     st.title("Filters")
 
     st.subheader("Mission")
-    all_missions = sorted(df['mission'].unique().tolist())
+    all_missions = meta['missions']
     selected_missions = st.multiselect(
         'Select Mission(s)',
         options=all_missions,
@@ -231,7 +744,7 @@ with st.sidebar:
     )
 
     st.subheader("Report Type")
-    all_report_types = sorted(df['report_type'].unique().tolist())
+    all_report_types = meta['report_types']
     selected_report_types = st.multiselect(
         'Select Report Type(s)',
         options=all_report_types,
@@ -239,8 +752,8 @@ with st.sidebar:
     )
 
     st.subheader("Date Range")
-    min_date = df['date'].min().date()
-    max_date = df['date'].max().date()
+    min_date = meta['min_date']
+    max_date = meta['max_date']
     selected_dates = st.date_input(
         "Select Date Range",
         value=(min_date, max_date),
@@ -249,79 +762,32 @@ with st.sidebar:
     )
 
     st.subheader("Risk Level")
-    all_risks = sorted([r for r in df['risk_level'].unique() if r != 'N/A'])
+    all_risks = meta['risks']
     selected_risk = st.multiselect(
         'Select Risk Level',
         options=all_risks,
         default=all_risks
     )
 
-    st.markdown("""
-    <div style="background-color:#f0f0f0; padding:10px; border-radius:5px; margin-top:20px;">
-        <h4>Need Help?</h4>
-        <p>This dashboard visualizes data from 5 report types:</p>
-        <ul>
-            <li><b>Security Incidents</b>: Active threats and attacks.</li>
-            <li><b>Compliance Reports</b>: Audits against standards.</li>
-            <li><b>Verification Reports</b>: Technical control checks.</li>
-            <li><b>Risk Assessments</b>: Identified business risks.</li>
-            <li><b>Regular Reports</b>: Weekly/monthly status.</li>
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
-    st.markdown("---") # Visual separator
+    # Help box and the visual separator below it go out as one element
+    st.markdown(HELP_HTML + "\n---\n", unsafe_allow_html=True)
 
     # 2. Chatbot Interface (placed second in sidebar)
     st.subheader("Simple Chat Demo")
-    # Use a container to display chat history cleanly in the sidebar
-    chat_container = st.container(height=300, border=True)
+    chat_demo()
 
-    with chat_container:
-        # Display chat messages from history
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                # The chat message content must be markdown for proper rendering
-                st.markdown(message["content"])
-
-
-    # Accept user input (uses st.sidebar.chat_input implicitly within the 'with st.sidebar:' block)
-    # Note: We must use the standard st.chat_input here, but it inherits the sidebar context.
-    if prompt := st.chat_input("What is up?", key="sidebar_chat_input"):
-        
-        # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        
-        # Display user message in the chat container
-        with chat_container:
-             with st.chat_message("user"):
-                st.markdown(prompt)
-
-        # Display assistant response in chat container
-        with chat_container:
-            with st.chat_message("assistant"):
-                # Use st.write_stream to generate and display the streamed response
-                response = st.write_stream(response_generator())
-        
-        # Add assistant response to chat history (after streaming is complete)
-        st.session_state.messages.append({"role": "assistant", "content": response})
-        
 
 # --- Apply Filters to Data ---
-filtered_df = df
-
 start_date, end_date = selected_dates
-filtered_df = filtered_df[
-    (filtered_df['date'].dt.date >= start_date) &
-    (filtered_df['date'].dt.date <= end_date)
-]
-
-filtered_df = filtered_df[
-    (filtered_df['mission'].isin(selected_missions)) &
-    (filtered_df['report_type'].isin(selected_report_types))
-]
-
-if len(selected_risk) < len(all_risks):
-     filtered_df = filtered_df[filtered_df['risk_level'].isin(selected_risk)]
+filters = (
+    tuple(selected_missions),
+    tuple(selected_report_types),
+    start_date,
+    end_date,
+    tuple(selected_risk)
+)
+filter_mask = apply_filters(*filters)
+filtered_df = df.loc[filter_mask]
 
 
 # --- Main Content Area ---
@@ -330,14 +796,21 @@ st.markdown("<h2 class='subtitle'>Mission Overview (Filtered)</h2>", unsafe_allo
 if filtered_df.empty:
     st.warning("No data available for the selected filters.")
 else:
-    incidents_df = filtered_df[filtered_df['report_type'] == 'Security Incident Report']
-    compliance_df = filtered_df[filtered_df['report_type'] == 'Compliance Report']
-    risk_df = filtered_df[filtered_df['report_type'] == 'Security Risk Assessment Report']
+    report_groups = split_by_report_type(*filters)
+    empty_df = filtered_df.iloc[0:0]
+
+    incidents_df = report_groups.get('Security Incident Report', empty_df)
 
     total_reports = len(filtered_df)
-    open_incidents = len(incidents_df[incidents_df['status'] == 'Investigating'])
-    high_risk_items = len(filtered_df[filtered_df['risk_level'] == 'High'])
-    avg_fix_time = incidents_df['time_to_fix_hours'].mean()
+    # Read the counts off categorical value_counts instead of materialising a
+    # filtered frame per KPI
+    open_incidents = int(incidents_df['status'].value_counts().get('Investigating', 0))
+    high_risk_items = int(filtered_df['risk_level'].value_counts().get('High', 0))
+    # nanmean over the raw float32 buffer; guarded because it warns when
+    # every value is missing (e.g. only open incidents are selected)
+    fix_hours = incidents_df['time_to_fix_hours'].to_numpy(dtype=np.float32, copy=False)
+    has_fix_time = fix_hours.size and not np.isnan(fix_hours).all()
+    avg_fix_time = float(np.nanmean(fix_hours)) if has_fix_time else float('nan')
 
     kpi1, kpi2, kpi3, kpi4 = st.columns(4)
     kpi1.metric("Total Reports Logged", f"{total_reports}")
@@ -351,132 +824,46 @@ else:
     with col1:
         st.markdown("### Security Incidents by Attack Type")
         if not incidents_df.empty:
-            attack_counts = incidents_df['attack_type'].value_counts().reset_index()
-            attack_counts.columns = ['Attack Type', 'Count']
-
-            fig_bar = px.bar(
-                attack_counts,
-                x='Attack Type',
-                y='Count',
-                color='Attack Type',
-                title='Frequency of Attack Types'
+            attack_counts = (
+                incidents_df['attack_type'].value_counts()
+                .loc[lambda c: c > 0]
+                .rename_axis('Attack Type')
+                .reset_index(name='Count')
             )
+            fig_bar = attack_type_chart(tuple(attack_counts.itertuples(index=False, name=None)))
             st.plotly_chart(fig_bar, width='stretch')
         else:
             st.info("No Security Incident data to display.")
 
     with col2:
         st.markdown("### Risk Level Distribution (All Reports)")
-        risk_data = filtered_df[filtered_df['risk_level'] != 'N/A']
+        rated = meta['rated']
+        risk_data = df.iloc[rated[filter_mask[rated]]]
         if not risk_data.empty:
-            risk_counts = risk_data['risk_level'].value_counts().reset_index()
-            risk_counts.columns = ['Risk Level', 'Count']
-
-            fig_pie = px.pie(
-                risk_counts,
-                names='Risk Level',
-                values='Count',
-                color='Risk Level',
-                color_discrete_map={
-                    'High': '#e74c3c',
-                    'Medium': '#f39c12',
-                    'Low': '#2ecc71'
-                },
-                title='Incidents by Risk Level'
+            risk_counts = (
+                risk_data['risk_level'].value_counts()
+                .loc[lambda c: c > 0]
+                .rename_axis('Risk Level')
+                .reset_index(name='Count')
             )
-            fig_pie.update_traces(textinfo='percent+label')
+            fig_pie = risk_level_chart(tuple(risk_counts.itertuples(index=False, name=None)))
             st.plotly_chart(fig_pie, width='stretch')
         else:
             st.info("No Risk Level data to display.")
 
     st.markdown("<h2 class='subtitle'>Report Timeline</h2>", unsafe_allow_html=True)
-    timeline_data = filtered_df.groupby([filtered_df['date'].dt.date, 'mission']).size().reset_index(name='count')
+    # Slice the precomputed daily counts rather than regrouping the reports
+    daily = meta['daily']
+    timeline_data = daily.loc[selection_mask(daily, meta, *filters)].groupby(
+        ['date_d', 'mission'], observed=True
+    )['Count'].sum().reset_index()
     timeline_data.columns = ['Date', 'Mission', 'Count']
+    if len(timeline_data) > TIMELINE_MAX_POINTS:
+        timeline_data = downsample_m4(timeline_data)
 
-    fig_line = px.line(
-        timeline_data,
-        x='Date',
-        y='Count',
-        color='Mission',
-        title='Daily Report Submissions by Mission'
-    )
+    fig_line = timeline_chart(tuple(timeline_data.itertuples(index=False, name=None)))
     st.plotly_chart(fig_line, width='stretch')
 
-    st.markdown("<h2 class='subtitle'>Detailed Findings & Action Items</h2>", unsafe_allow_html=True)
-
-    tab_inc, tab_comp, tab_ver, tab_risk, tab_reg = st.tabs([
-        "🚨 Incidents",
-        "📜 Compliance Findings",
-        "🔬 Verification Gaps",
-        "📈 Risk Treatment",
-        "📓 Regular Summaries"
-    ])
-
-    # Helper function to safely select columns
-    def safe_select_columns(dataframe, columns):
-        """Select only columns that exist in the dataframe"""
-        existing_cols = [col for col in columns if col in dataframe.columns]
-        if not existing_cols:
-            return pd.DataFrame()
-        return dataframe[existing_cols]
-
-    with tab_inc:
-        st.subheader("Security Incident Details")
-        incident_cols = ['mission', 'date', 'attack_type', 'risk_level', 'status',
-                        'root_cause', 'remediation_measures', 'time_to_fix_hours']
-        display_df = safe_select_columns(incidents_df, incident_cols)
-        if not display_df.empty:
-            st.dataframe(display_df, width='stretch')
-        else:
-            st.info("No incident data available.")
-
-    with tab_comp:
-        st.subheader("Compliance Non-Conformities")
-        compliance_cols = ['mission', 'date', 'compliance_evaluation_results',
-                          'identified_non_conformities_and_recommendations',
-                          'follow_up_actions_and_deadlines']
-        display_df = safe_select_columns(compliance_df, compliance_cols)
-        if not display_df.empty:
-            st.dataframe(display_df, width='stretch')
-        else:
-            st.info("No compliance data available.")
-
-    with tab_ver:
-        st.subheader("Security Verification Gaps")
-        verification_df = filtered_df[filtered_df['report_type'] == 'Security Verification Report']
-        verification_cols = ['mission', 'date', 'security_control_checks',
-                            'findings_from_technical_verifications',
-                            'identified_gaps_and_proposed_corrective_actions']
-        display_df = safe_select_columns(verification_df, verification_cols)
-        if not display_df.empty:
-            st.dataframe(display_df, width='stretch')
-        else:
-            st.info("No verification data available.")
+    detail_tabs(df_full, report_groups, empty_df)
 
-    with tab_risk:
-        st.subheader("Risk Assessment Treatment Plans")
-        risk_cols = ['mission', 'date', 'identified_risks_and_threat_scenarios', 'risk_level',
-                    'likelihood_and_impact_assessments', 'existing_mitigations_and_residual_risks',
-                    'risk_treatment_plan_and_responsible_entities']
-        display_df = safe_select_columns(risk_df, risk_cols)
-        if not display_df.empty:
-            st.dataframe(display_df, width='stretch')
-        else:
-            st.info("No risk assessment data available.")
-
-    with tab_reg:
-        st.subheader("Regular Report Summaries")
-        regular_df = filtered_df[filtered_df['report_type'] == 'Security Regular Report']
-        regular_cols = ['mission', 'date', 'summary_of_ongoing_security_operations',
-                       'notable_security_events', 'progress_on_mitigation_actions']
-        display_df = safe_select_columns(regular_df, regular_cols)
-        if not display_df.empty:
-            st.dataframe(display_df, width='stretch')
-        else:
-            st.info("No regular report data available.")
-
-st.markdown("""
-<div style="background-color:#f0f0f0; padding:10px; border-radius:5px; margin-top:20px; text-align:center;">
-    <p>Mission Security Dashboard | Data as of: """ + str(df['date'].max().date()) + """</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_HTML.format(data_as_of=meta['max_date']), unsafe_allow_html=True)